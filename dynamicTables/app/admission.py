@@ -0,0 +1,266 @@
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from rest_framework import status
+
+from dynamicTables.app.models import AdmissionMetric
+
+QUERY_CANCELED_PGCODE = '57014'
+QUEUE_POLL_INTERVAL = 0.05
+
+DEFAULT_ADMISSION_SETTINGS = {
+    'MAX_QUERY_COST': 1_000_000,
+    'HEAVY_QUERY_COST': 10_000,
+    'MAX_HEAVY_QUERIES_PER_TABLE': 2,
+    'QUEUE_TIMEOUT': 5,
+    'STATEMENT_TIMEOUT_MS': 5_000,
+    'COST_CACHE_SIZE': 512,
+    'COST_CACHE_SIZE_CHECK_INTERVAL': 10,
+    'METRICS_FLUSH_INTERVAL': 5,
+}
+
+_cost_cache = OrderedDict()
+_cost_cache_lock = threading.Lock()
+
+_metrics = Counter()
+_metrics_flushed_at = time.monotonic()
+_metrics_lock = threading.Lock()
+
+
+class QueryRejected(Exception):
+    """
+    Raised when admission control refuses to run a query.
+
+    Attributes:
+        detail: A human readable reason, returned to the client as 'detail'.
+        status_code: The HTTP status the view should respond with.
+    """
+
+    def __init__(self, detail, status_code=status.HTTP_429_TOO_MANY_REQUESTS):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def get_admission_setting(name):
+    """
+    Returns an admission control setting, falling back to DEFAULT_ADMISSION_SETTINGS when the
+    DYNAMIC_TABLES_ADMISSION setting does not override it.
+    """
+    overrides = getattr(settings, 'DYNAMIC_TABLES_ADMISSION', {})
+    return overrides.get(name, DEFAULT_ADMISSION_SETTINGS[name])
+
+
+def record_metric(name, amount=1):
+    """
+    Counts an admission control decision.
+
+    Counts are buffered in the process and added to the shared admission_metric table at most every
+    METRICS_FLUSH_INTERVAL seconds, so recording a decision usually does not touch the database. Flushes are
+    skipped inside a transaction, which could roll them back.
+    """
+    with _metrics_lock:
+        _metrics[name] += amount
+        flush_due = time.monotonic() - _metrics_flushed_at >= get_admission_setting('METRICS_FLUSH_INTERVAL')
+    if flush_due and not connection.in_atomic_block:
+        flush_metrics()
+
+
+def flush_metrics():
+    global _metrics_flushed_at
+    with _metrics_lock:
+        pending = dict(_metrics)
+        _metrics.clear()
+        _metrics_flushed_at = time.monotonic()
+    if not pending:
+        return
+    try:
+        AdmissionMetric.increment(pending)
+    except Exception:
+        with _metrics_lock:
+            _metrics.update(pending)
+        raise
+
+
+def get_metrics():
+    """
+    Returns the admission control counters of all processes sharing the database.
+
+    Counts still buffered in other processes show up after at most METRICS_FLUSH_INTERVAL seconds.
+    """
+    flush_metrics()
+    return AdmissionMetric.get_counts()
+
+
+def reset_admission_state():
+    """
+    Clears cached cost estimates and metrics not yet flushed to the database.
+    """
+    with _cost_cache_lock:
+        _cost_cache.clear()
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _get_cost_cache_key(sql, params):
+    buckets = []
+    for value in params or []:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Offsets, limits and sample percentages change the cost roughly in proportion to their value.
+            buckets.append(math.floor(math.log10(value)) if value > 0 else None)
+        else:
+            buckets.append(value)
+    return sql, tuple(buckets)
+
+
+def _get_table_pages(table_name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_relation_size(to_regclass(%s)) / current_setting('block_size')::int", [table_name]
+        )
+        return max(cursor.fetchone()[0] or 0, 1)
+
+
+def estimate_query_cost(table_name, sql, params=None):
+    """
+    Estimates the planner cost of a query with EXPLAIN.
+
+    Estimates are cached per query shape, i.e. the SQL text with its placeholders and the order of magnitude of
+    each numeric parameter, so repeated requests do not touch the database at all. String parameters are part of
+    the key as they are. At most every COST_CACHE_SIZE_CHECK_INTERVAL seconds a cached estimate is checked against
+    the current size of the table, and discarded once the table has grown or shrunk by more than a factor of two
+    since it was made.
+
+    Parameters:
+        table_name: The name of the dynamic table being queried.
+        sql: The SQL text with %s placeholders.
+        params: The parameters for the placeholders.
+
+    Returns:
+        The 'Total Cost' of the top plan node.
+    """
+    cache_key = _get_cost_cache_key(sql, params)
+    now = time.monotonic()
+
+    with _cost_cache_lock:
+        cached = _cost_cache.get(cache_key)
+    if cached is not None:
+        cost, cached_pages, checked_at = cached
+        size_checked = now - checked_at < get_admission_setting('COST_CACHE_SIZE_CHECK_INTERVAL')
+        if not size_checked:
+            pages = _get_table_pages(table_name)
+            size_checked = cached_pages / 2 <= pages <= cached_pages * 2
+            if size_checked:
+                with _cost_cache_lock:
+                    _cost_cache[cache_key] = (cost, cached_pages, now)
+        if size_checked:
+            with _cost_cache_lock:
+                if cache_key in _cost_cache:
+                    _cost_cache.move_to_end(cache_key)
+            record_metric('cost_cache_hits')
+            return cost
+
+    record_metric('cost_cache_misses')
+    pages = _get_table_pages(table_name)
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    cost = plan[0]['Plan']['Total Cost']
+
+    with _cost_cache_lock:
+        _cost_cache[cache_key] = (cost, pages, now)
+        _cost_cache.move_to_end(cache_key)
+        while len(_cost_cache) > get_admission_setting('COST_CACHE_SIZE'):
+            _cost_cache.popitem(last=False)
+    return cost
+
+
+def _acquire_heavy_query_slot(table_name):
+    """
+    Takes one of the MAX_HEAVY_QUERIES_PER_TABLE slots of a table, waiting up to QUEUE_TIMEOUT seconds.
+
+    Slots are session level advisory locks keyed by the table name, so the limit holds across all processes
+    and hosts sharing the database. A crashed process releases its slot together with its connection.
+
+    Returns:
+        The slot number, or None if no slot became free in time.
+    """
+    deadline = time.monotonic() + get_admission_setting('QUEUE_TIMEOUT')
+    queued = False
+    with connection.cursor() as cursor:
+        while True:
+            for slot in range(get_admission_setting('MAX_HEAVY_QUERIES_PER_TABLE')):
+                cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s), %s)", [table_name, slot])
+                if cursor.fetchone()[0]:
+                    return slot
+            if not queued:
+                record_metric('queued')
+                queued = True
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(QUEUE_POLL_INTERVAL)
+
+
+def _release_heavy_query_slot(table_name, slot):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(hashtext(%s), %s)", [table_name, slot])
+
+
+@contextmanager
+def admit_query(table_name, sql, params=None, statement_timeout_ms=None, check_budget=True):
+    """
+    Admission control for read queries against a dynamic table.
+
+    The query cost is estimated first. Queries above MAX_QUERY_COST are rejected outright. Queries above
+    HEAVY_QUERY_COST take a per-table slot, waiting up to QUEUE_TIMEOUT seconds for one to free up, so only
+    MAX_HEAVY_QUERIES_PER_TABLE heavy queries run against a table at a time across all processes. The body of
+    the block runs in a transaction with statement_timeout set to STATEMENT_TIMEOUT_MS.
+
+    Parameters:
+        table_name: The name of the dynamic table being queried.
+        sql: The SQL text with %s placeholders.
+        params: The parameters for the placeholders.
+        statement_timeout_ms: Overrides STATEMENT_TIMEOUT_MS for this query.
+        check_budget: If False, the query is not rejected for exceeding MAX_QUERY_COST. It still takes a heavy
+            query slot and runs under the statement timeout, which is then the only guard.
+
+    Raises:
+        QueryRejected: If the query is over budget, no slot became free in time or the statement timed out.
+    """
+    cost = estimate_query_cost(table_name, sql, params)
+
+    if check_budget and cost > get_admission_setting('MAX_QUERY_COST'):
+        record_metric('rejected_over_budget')
+        raise QueryRejected('Query cost exceeds budget.', status.HTTP_400_BAD_REQUEST)
+
+    slot = None
+    if cost > get_admission_setting('HEAVY_QUERY_COST'):
+        slot = _acquire_heavy_query_slot(table_name)
+        if slot is None:
+            record_metric('rejected_queue_timeout')
+            raise QueryRejected('Too many heavy queries on this table, try again later.')
+        record_metric('admitted_heavy')
+    else:
+        record_metric('admitted_light')
+
+    if statement_timeout_ms is None:
+        statement_timeout_ms = get_admission_setting('STATEMENT_TIMEOUT_MS')
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = %s", [statement_timeout_ms])
+            yield cost
+    except OperationalError as exc:
+        if getattr(exc.__cause__, 'pgcode', None) != QUERY_CANCELED_PGCODE:
+            raise
+        record_metric('statement_timeouts')
+        raise QueryRejected('Query timed out.', status.HTTP_503_SERVICE_UNAVAILABLE) from exc
+    finally:
+        if slot is not None:
+            _release_heavy_query_slot(table_name, slot)
@@ -1,4 +1,7 @@
-from django.db import models
+import hashlib
+import json
+
+from django.db import connection, models
 from django.db.models import JSONField
 
 
@@ -16,3 +19,34 @@ class TableMetadata(models.Model):
     @classmethod
     def save_entity(cls, table_name: str, fields: list[dict[str, str]]) -> None:
         cls.objects.create(table_name=table_name, fields=fields)
+
+    @classmethod
+    def get_schema_tables(cls) -> list[tuple[int, str, list[dict[str, str]]]]:
+        return list(cls.objects.order_by('id').values_list('id', 'table_name', 'fields'))
+
+    @classmethod
+    def get_schema_version(cls, tables: list[tuple[int, str, list[dict[str, str]]]]) -> str:
+        return hashlib.sha1(json.dumps(tables, sort_keys=True).encode()).hexdigest()
+
+
+class AdmissionMetric(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "admission_metric"
+
+    @classmethod
+    def increment(cls, counts: dict[str, int]) -> None:
+        values = ', '.join(['(%s, %s)'] * len(counts))
+        params = [value for item in counts.items() for value in item]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {cls._meta.db_table} (name, count) VALUES {values} "
+                f"ON CONFLICT (name) DO UPDATE SET count = {cls._meta.db_table}.count + EXCLUDED.count",
+                params
+            )
+
+    @classmethod
+    def get_counts(cls) -> dict[str, int]:
+        return dict(cls.objects.values_list('name', 'count'))
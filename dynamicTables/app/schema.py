@@ -0,0 +1,60 @@
+import threading
+
+from django.views.decorators.csrf import csrf_exempt
+
+_deferred_schema_overrides = []
+_deferred_schema_overrides_applied = False
+_schema_view_lock = threading.Lock()
+
+
+def swagger_auto_schema(**kwargs):
+    """
+    Records drf_yasg swagger_auto_schema arguments for a view method without importing drf_yasg.
+
+    The arguments are handed to the real decorator the first time the API docs are requested, so processes that
+    never serve docs do not load drf_yasg's inspectors, generators and renderers.
+    """
+    def decorator(view_method):
+        _deferred_schema_overrides.append((view_method, kwargs))
+        return view_method
+    return decorator
+
+
+def _apply_deferred_schema_overrides():
+    global _deferred_schema_overrides_applied
+    if _deferred_schema_overrides_applied:
+        return
+
+    from drf_yasg.utils import swagger_auto_schema as drf_yasg_swagger_auto_schema
+
+    for view_method, kwargs in _deferred_schema_overrides:
+        drf_yasg_swagger_auto_schema(**kwargs)(view_method)
+    _deferred_schema_overrides_applied = True
+
+
+def lazy_schema_view(renderer=None):
+    """
+    Returns a view serving the API schema, which builds the drf_yasg schema view on its first request.
+
+    Parameters:
+        renderer: The UI renderer, 'swagger' or 'redoc'. None serves the raw JSON or YAML schema.
+    """
+    view = None
+
+    @csrf_exempt
+    def schema_view(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            with _schema_view_lock:
+                if view is None:
+                    from dynamicTables.app.schema_generator import get_schema_view
+
+                    _apply_deferred_schema_overrides()
+                    schema_view_class = get_schema_view()
+                    if renderer is None:
+                        view = schema_view_class.without_ui(cache_timeout=0)
+                    else:
+                        view = schema_view_class.with_ui(renderer, cache_timeout=0)
+        return view(request, *args, **kwargs)
+
+    return schema_view
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db.models.signals import post_delete, post_save
+from django.urls import reverse
+from drf_yasg import openapi
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view as drf_yasg_get_schema_view
+from rest_framework import permissions
+
+from dynamicTables.app.models import TableMetadata
+from dynamicTables.app.utils import get_sql_field_type
+
+SQL_TYPE_SCHEMAS = {
+    'varchar(255)': {'type': openapi.TYPE_STRING, 'max_length': 255},
+    'integer': {'type': openapi.TYPE_INTEGER},
+    'boolean': {'type': openapi.TYPE_BOOLEAN},
+    'text': {'type': openapi.TYPE_STRING},
+}
+
+TABLE_DATA_OPERATION_ID = 'table_data_read'
+SCHEMA_CACHE_SIZE = 8
+SCHEMA_VERSION_TTL = 30
+
+_schema_cache = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+_schema_tables = None
+_schema_tables_lock = threading.Lock()
+
+
+def get_table_definition_name(table_name):
+    return f"{table_name}_row"
+
+
+def get_table_definitions(tables):
+    """
+    Builds an OpenAPI definition describing a row of each dynamic table.
+
+    Parameters:
+        tables: A list of (id, table_name, fields) tuples, where fields is TableMetadata.fields.
+
+    Returns:
+        A dictionary mapping '<table_name>_row' to the schema of a row of that table.
+    """
+    definitions = {}
+    for _, table_name, fields in tables:
+        properties = {'id': openapi.Schema(type=openapi.TYPE_INTEGER, read_only=True)}
+        for field in fields:
+            properties[field['name']] = openapi.Schema(**SQL_TYPE_SCHEMAS[get_sql_field_type(field['type'])])
+        definitions[get_table_definition_name(table_name)] = openapi.Schema(
+            title=table_name, type=openapi.TYPE_OBJECT, properties=properties
+        )
+    return definitions
+
+
+def get_schema_tables():
+    """
+    Returns the dynamic tables and their schema version.
+
+    The result is kept until TableMetadata is saved or deleted in this process. Changes made by other processes
+    are picked up after at most SCHEMA_VERSION_TTL seconds.
+
+    Returns:
+        A (schema_version, tables) pair, where tables is a list of (id, table_name, fields) tuples.
+    """
+    global _schema_tables
+    with _schema_tables_lock:
+        if _schema_tables is not None and time.monotonic() - _schema_tables[0] < SCHEMA_VERSION_TTL:
+            return _schema_tables[1:]
+
+    tables = TableMetadata.get_schema_tables()
+    schema_version = TableMetadata.get_schema_version(tables)
+    with _schema_tables_lock:
+        _schema_tables = (time.monotonic(), schema_version, tables)
+    return schema_version, tables
+
+
+def clear_schema_tables(**kwargs):
+    global _schema_tables
+    with _schema_tables_lock:
+        _schema_tables = None
+
+
+post_save.connect(clear_schema_tables, sender=TableMetadata, dispatch_uid='clear_schema_tables_on_save')
+post_delete.connect(clear_schema_tables, sender=TableMetadata, dispatch_uid='clear_schema_tables_on_delete')
+
+
+class TableSchemaGenerator(OpenAPISchemaGenerator):
+    """
+    Schema generator that describes the rows of every dynamic table and caches the generated schema.
+
+    Each table gets a '<table_name>_row' definition and its own variant of the row-read path, whose response
+    refers to that definition. The cache is keyed by the schema version, so the schema is regenerated only after
+    a table has been created or its fields have changed, and holds at most SCHEMA_CACHE_SIZE schemas.
+    """
+
+    def get_schema(self, request=None, public=False):
+        schema_version, tables = get_schema_tables()
+        base_url = self.url
+        if base_url is None and request is not None:
+            base_url = request.build_absolute_uri('/')
+        cache_key = (schema_version, self.version, public, base_url)
+
+        with _schema_cache_lock:
+            schema = _schema_cache.get(cache_key)
+            if schema is not None:
+                _schema_cache.move_to_end(cache_key)
+                return schema
+
+        schema = super().get_schema(request=request, public=public)
+        definitions = dict(schema.get('definitions') or {})
+        definitions.update(get_table_definitions(tables))
+        schema.definitions = definitions
+        self.add_table_paths(schema, tables)
+
+        with _schema_cache_lock:
+            for key in [key for key in _schema_cache if key[0] != schema_version]:
+                del _schema_cache[key]
+            _schema_cache[cache_key] = schema
+            while len(_schema_cache) > SCHEMA_CACHE_SIZE:
+                _schema_cache.popitem(last=False)
+        return schema
+
+    def add_table_paths(self, schema, tables):
+        """
+        Adds a row-read path for each table, e.g. /table/1/data, answering with a list of '<table_name>_row'.
+        """
+        read_operation = next(
+            (
+                path_item['get'] for path_item in schema['paths'].values()
+                if 'get' in path_item and path_item['get'].get('operationId') == TABLE_DATA_OPERATION_ID
+            ),
+            None
+        )
+        if read_operation is None:
+            return
+
+        base_path = schema.get('basePath', '/').rstrip('/')
+        for table_id, table_name, _ in tables:
+            path = reverse('get_table_data', kwargs={'pk': table_id})[len(base_path):]
+            rows_schema = openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items={'$ref': f"#/definitions/{get_table_definition_name(table_name)}"}
+            )
+            schema['paths'][path] = openapi.PathItem(get=openapi.Operation(
+                operation_id=f"{TABLE_DATA_OPERATION_ID}_{table_name}",
+                responses=openapi.Responses({200: openapi.Response(f"Rows of {table_name}", rows_schema)}),
+                parameters=read_operation.get('parameters'),
+                description=read_operation.get('description'),
+                tags=[table_name],
+            ))
+
+
+def get_schema_view():
+    return drf_yasg_get_schema_view(
+        openapi.Info(
+            title="Dynamic tables",
+            default_version='v1',
+            description="Dynamic table API generator",
+            contact=openapi.Contact(email="temirlan1990@gmail.com"),
+            license=openapi.License(name="No any license"),
+        ),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+        generator_class=TableSchemaGenerator,
+    )
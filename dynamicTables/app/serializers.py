@@ -6,6 +6,7 @@ from dynamicTables.app.models import TableMetadata
 class FieldSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255)
     type = serializers.ChoiceField(choices=['string', 'number', 'boolean'])
+    searchable = serializers.BooleanField(default=False)
 
     def validate_name(self, value):
         request = self.context.get('request', None)
@@ -17,6 +18,11 @@ class FieldSerializer(serializers.Serializer):
                 raise serializers.ValidationError(f"Field with this '{value}' name already exists.")
         return value
 
+    def validate(self, attrs):
+        if attrs.get('searchable') and attrs['type'] != 'string':
+            raise serializers.ValidationError({'searchable': "Only string fields can be searchable."})
+        return attrs
+
 
 class DynamicTableSerializer(serializers.Serializer):
     table_name = serializers.CharField(max_length=255)
@@ -25,3 +31,27 @@ class DynamicTableSerializer(serializers.Serializer):
 
 class UpdateTableSerializer(serializers.Serializer):
     fields = FieldSerializer(many=True)
+
+
+class TableDataQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+    offset = serializers.IntegerField(min_value=0, default=0)
+    sample = serializers.FloatField(min_value=0, max_value=100, required=False)
+    sample_method = serializers.ChoiceField(choices=['system', 'bernoulli'], default='system')
+    seed = serializers.IntegerField(required=False)
+    search = serializers.CharField(max_length=255, required=False)
+
+    def validate_sample(self, value):
+        if value == 0:
+            raise serializers.ValidationError("Sample percentage must be greater than 0.")
+        return value
+
+    def validate(self, attrs):
+        if 'seed' in attrs and 'sample' not in attrs:
+            raise serializers.ValidationError({'seed': "Seed can only be used together with sample."})
+        return attrs
+
+
+class TableStatsQuerySerializer(serializers.Serializer):
+    exact = serializers.BooleanField(default=False)
+    timeout_ms = serializers.IntegerField(min_value=1, max_value=60_000, required=False)
@@ -0,0 +1,50 @@
+from django.db import connection
+
+from dynamicTables.app.utils import dictfetchall
+
+
+def get_table_stats(table_name):
+    """
+    Reads planner statistics for a table from pg_class and pg_stats. Nothing here touches the table itself,
+    so the cost does not grow with the number of rows.
+
+    The estimates are as fresh as the last ANALYZE (or autovacuum) of the table. Tables that were never
+    analyzed report None for the estimated row count and have no per-column statistics.
+
+    Parameters:
+        table_name: The name of the table.
+
+    Returns:
+        A dictionary with 'estimated_row_count', 'total_size_bytes', 'table_size_bytes' and 'columns', where
+        'columns' is a list of dictionaries with 'name', 'null_fraction' and 'distinct_estimate'.
+        A negative 'distinct_estimate' is a fraction of the row count, as reported by pg_stats.
+        Returns None if the table does not exist.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname,
+                   c.reltuples,
+                   pg_total_relation_size(c.oid),
+                   pg_relation_size(c.oid)
+            FROM pg_class c
+            WHERE c.oid = to_regclass(%s)
+        """, [table_name])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        relname, reltuples, total_size, table_size = row
+
+        cursor.execute("""
+            SELECT attname AS name, null_frac AS null_fraction, n_distinct AS distinct_estimate
+            FROM pg_stats
+            WHERE schemaname = current_schema() AND tablename = %s
+            ORDER BY attname
+        """, [relname])
+        columns = dictfetchall(cursor)
+
+    return {
+        'estimated_row_count': int(reltuples) if reltuples >= 0 else None,
+        'total_size_bytes': total_size,
+        'table_size_bytes': table_size,
+        'columns': columns,
+    }
@@ -1,3 +1,12 @@
+import hashlib
+from contextlib import nullcontext
+
+from django.db import DatabaseError, connection, transaction
+
+SEARCH_CONFIG = 'simple'
+MAX_IDENTIFIER_LENGTH = 63
+
+
 def get_sql_field_type(field_type):
     if field_type == 'string':
         return 'varchar(255)'
@@ -7,3 +16,110 @@ def get_sql_field_type(field_type):
         return 'boolean'
     else:
         return 'text'
+
+
+def dictfetchall(cursor):
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_searchable_field_names(fields):
+    return [field['name'] for field in fields if field.get('searchable')]
+
+
+def get_search_document_sql(fields):
+    """
+    Builds the tsvector expression over the searchable fields of a table. Search queries must use exactly this
+    expression for PostgreSQL to match them to the GIN expression index.
+
+    Parameters:
+        fields: The fields of the table, as stored in TableMetadata.fields.
+
+    Returns:
+        The SQL expression, or None if the table has no searchable fields.
+    """
+    searchable_field_names = get_searchable_field_names(fields)
+    if not searchable_field_names:
+        return None
+
+    document = " || ' ' || ".join([f"coalesce({name}, '')" for name in searchable_field_names])
+    return f"to_tsvector('{SEARCH_CONFIG}', {document})"
+
+
+def get_search_index_name(table_name, suffix='search_idx'):
+    """
+    Builds the name of a search index of a table. PostgreSQL silently truncates identifiers to 63 bytes, so
+    long table names are shortened and suffixed with a hash of the full name to keep index names distinct.
+    """
+    index_name = f"{table_name}_{suffix}"
+    if len(index_name.encode()) <= MAX_IDENTIFIER_LENGTH:
+        return index_name
+
+    tail = f"_{hashlib.sha1(table_name.encode()).hexdigest()[:8]}_{suffix}"
+    prefix = table_name.encode()[:MAX_IDENTIFIER_LENGTH - len(tail)].decode(errors='ignore')
+    return f"{prefix}{tail}"
+
+
+def get_search_index_sql(table_name, fields, index_name=None, concurrently=False):
+    """
+    Builds the statement creating a GIN expression index over the searchable fields of a table.
+
+    Parameters:
+        table_name: The name of the table.
+        fields: The fields of the table, as stored in TableMetadata.fields.
+        index_name: The name of the index, get_search_index_name(table_name) by default.
+        concurrently: Build the index without blocking writes. Cannot be used inside a transaction.
+
+    Returns:
+        The SQL statement, or None if the table has no searchable fields.
+    """
+    document = get_search_document_sql(fields)
+    if document is None:
+        return None
+
+    index_name = index_name or get_search_index_name(table_name)
+    concurrently_sql = 'CONCURRENTLY ' if concurrently else ''
+    return f"CREATE INDEX {concurrently_sql}{index_name} ON {table_name} USING GIN ({document});"
+
+
+def rebuild_search_index(table_name, fields):
+    """
+    Replaces the search index of a table after its searchable fields changed.
+
+    The new index is built next to the old one, which keeps serving searches until it is dropped. Outside a
+    transaction both steps run CONCURRENTLY, so reads and writes to a large table are not blocked while it is
+    indexed. If the new index cannot be built, it is cleaned up and the old index is left in place.
+
+    Parameters:
+        table_name: The name of the table.
+        fields: The fields of the table, as stored in TableMetadata.fields.
+
+    Returns:
+        True if the index was replaced, False if building the new index failed.
+    """
+    concurrently = not connection.in_atomic_block
+    concurrently_sql = 'CONCURRENTLY ' if concurrently else ''
+    index_name = get_search_index_name(table_name)
+    new_index_name = get_search_index_name(table_name, 'search_new')
+
+    # Inside a transaction a failed statement aborts it, so the build runs in a savepoint there.
+    try:
+        with nullcontext() if concurrently else transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP INDEX {concurrently_sql}IF EXISTS {new_index_name};")
+                cursor.execute(get_search_index_sql(table_name, fields, new_index_name, concurrently=concurrently))
+    except DatabaseError:
+        if concurrently:
+            # A failed CREATE INDEX CONCURRENTLY leaves an invalid index behind. Dropping it is best effort, the
+            # next rebuild drops it as well.
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index_name};")
+            except DatabaseError:
+                pass
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX {concurrently_sql}IF EXISTS {index_name};")
+        cursor.execute(f"ALTER INDEX {new_index_name} RENAME TO {index_name};")
+    return True
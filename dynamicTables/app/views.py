@@ -1,16 +1,28 @@
-from django.db import connection
-from drf_yasg.utils import swagger_auto_schema
+from django.db import connection, transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from dynamicTables.app.admission import QueryRejected, admit_query, get_metrics
 from dynamicTables.app.models import TableMetadata
+from dynamicTables.app.schema import swagger_auto_schema
 from dynamicTables.app.serializers import (
     DynamicTableSerializer,
     UpdateTableSerializer,
-    FieldSerializer
+    FieldSerializer,
+    TableDataQuerySerializer,
+    TableStatsQuerySerializer
+)
+from dynamicTables.app.stats import get_table_stats
+from dynamicTables.app.utils import (
+    SEARCH_CONFIG,
+    get_sql_field_type,
+    get_searchable_field_names,
+    get_search_document_sql,
+    get_search_index_sql,
+    rebuild_search_index,
+    dictfetchall
 )
-from dynamicTables.app.utils import get_sql_field_type
 
 
 class DynamicTableView(APIView):
@@ -21,7 +33,8 @@ class DynamicTableView(APIView):
     Methods:
         post: Accepts a POST request with a JSON body. The JSON should contain 'table_name' and 'fields' key-value pairs.
                 'table_name' is the name of the table to be created.
-                'fields' is a list of dictionaries, each containing 'name' and 'type' of the field.
+                'fields' is a list of dictionaries, each containing 'name' and 'type' of the field and optionally
+                'searchable' for string fields that should be indexed for full-text search.
                 Creates a table in the database with the provided name and fields.
                 If the table already exists, it returns an HTTP 400 Bad Request status.
                 If the table is successfully created, it returns an HTTP 201 Created status.
@@ -35,7 +48,8 @@ class DynamicTableView(APIView):
         """
         Accepts a POST request with a JSON body. The JSON should contain 'table_name' and 'fields' key-value pairs.
         'table_name' is the name of the table to be created.
-        'fields' is a list of dictionaries, each containing 'name' and 'type' of the field.
+        'fields' is a list of dictionaries, each containing 'name' and 'type' of the field and optionally
+        'searchable' for string fields that should be indexed for full-text search.
 
         Parameters:
             request: A Django REST Framework request object.
@@ -66,10 +80,15 @@ class DynamicTableView(APIView):
 
             sql = f"CREATE TABLE {table_name} (id serial PRIMARY KEY, {table_fields});"
 
-            with connection.cursor() as cursor:
-                cursor.execute(sql)
+            search_index_sql = get_search_index_sql(table_name, fields)
 
-            TableMetadata.save_entity(table_name=table_name, fields=fields)
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql)
+                    if search_index_sql:
+                        cursor.execute(search_index_sql)
+
+                TableMetadata.save_entity(table_name=table_name, fields=fields)
 
             return Response({'detail': 'Table created.'}, status=status.HTTP_201_CREATED)
 
@@ -122,19 +141,23 @@ class UpdateTableView(APIView):
             fields = serializer.validated_data['fields']
 
             drop_sql = f"DROP TABLE IF EXISTS {table_metadata.table_name};"
-            with connection.cursor() as cursor:
-                cursor.execute(drop_sql)
 
             table_fields = ', '.join(
                 [f"{field['name']} {get_sql_field_type(field['type'])}" for field in fields]
             )
 
             create_sql = f"CREATE TABLE {table_metadata.table_name} (id serial PRIMARY KEY, {table_fields});"
-            with connection.cursor() as cursor:
-                cursor.execute(create_sql)
+            search_index_sql = get_search_index_sql(table_metadata.table_name, fields)
 
-            table_metadata.fields = fields
-            table_metadata.save()
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(drop_sql)
+                    cursor.execute(create_sql)
+                    if search_index_sql:
+                        cursor.execute(search_index_sql)
+
+                table_metadata.fields = fields
+                table_metadata.save()
 
             return Response({'detail': 'Table structure replaced.'}, status=status.HTTP_200_OK)
 
@@ -173,6 +196,7 @@ class UpdateTableRowView(APIView):
 
             If the table is successfully updated, it returns an HTTP 200 OK status with a JSON body containing
             'detail': 'Table updated.'
+            If the search index could not be rebuilt for new searchable fields, the body also contains a 'warning'.
 
             If there is any validation error in the input, it returns an HTTP 400 Bad Request status with a JSON body
             containing the validation errors.
@@ -191,13 +215,23 @@ class UpdateTableRowView(APIView):
             )
 
             sql = f"ALTER TABLE {table_metadata.table_name} {table_fields};"
+            updated_fields = table_metadata.fields + fields
 
-            with connection.cursor() as cursor:
-                cursor.execute(sql)
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql)
 
-            updated_fields = table_metadata.fields + fields
-            table_metadata.fields = updated_fields
-            table_metadata.save()
+                table_metadata.fields = updated_fields
+                table_metadata.save()
+
+            # Until the new index is built, searches over the new field set still work, only without an index.
+            if get_searchable_field_names(fields) and not rebuild_search_index(
+                table_metadata.table_name, updated_fields
+            ):
+                return Response({
+                    'detail': 'Table updated.',
+                    'warning': 'Search index could not be rebuilt, searches on this table run without an index.'
+                }, status=status.HTTP_200_OK)
 
             return Response({'detail': 'Table updated.'}, status=status.HTTP_200_OK)
 
@@ -240,3 +274,208 @@ class TableRowsView(APIView):
             return Response({'detail': 'Table not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         return Response(table_metadata.fields, status=status.HTTP_200_OK)
+
+
+class TableDataView(APIView):
+    """
+    The TableDataView is a Django REST Framework view that provides an API endpoint for reading the rows stored in a
+    table in the database. It inherits from the APIView provided by the Django REST Framework.
+
+    Every read goes through admission control, so a single expensive scan cannot starve other clients.
+
+    Methods:
+        get: Accepts a GET request with optional 'limit', 'offset', 'sample', 'sample_method', 'seed' and 'search'
+             query parameters.
+             Fetches a page of rows from the specified table ordered by id.
+             If 'sample' is given, only that percentage of the table is read using TABLESAMPLE and the sampled
+             rows are returned in random order, which gives a fast random preview of a large table.
+             If 'search' is given, only rows matching it in the searchable fields are returned, best match first.
+             If the table does not exist, it returns an HTTP 404 Not Found status.
+             If the query is refused by admission control, it returns the status chosen by admission control.
+             If the rows are successfully fetched, it returns an HTTP 200 OK status along with the rows.
+    """
+
+    @swagger_auto_schema(
+        query_serializer=TableDataQuerySerializer,
+        responses={200: 'Rows of the table'},
+        operation_id='table_data_read',
+        operation_description="Endpoint to read a page of rows from table in DB"
+    )
+    def get(self, request, pk):
+        """
+        Accepts a GET request with optional 'limit', 'offset', 'sample', 'sample_method', 'seed' and 'search'
+        query parameters.
+        Fetches a page of rows from the specified table ordered by id.
+        'sample' is a percentage of the table to read, 'sample_method' is 'system' (random pages, fastest) or
+        'bernoulli' (random rows, scans the whole table). Sampled rows are returned in random order. Every request
+        draws a new sample unless 'seed' is given; requests with the same 'seed' read the same sample in the same
+        order, so 'offset' pages through it.
+        'search' is a web search style query (quoted phrases, 'or', '-' to exclude) matched against the searchable
+        fields through their GIN index. Matching rows are ordered by rank instead of id.
+
+        Parameters:
+            request: A Django REST Framework request object.
+            pk: An integer representing the primary key of the table metadata.
+
+        Returns:
+            If the table does not exist, it returns an HTTP 404 Not Found status with a JSON body containing
+            'detail': 'Table not found.'
+
+            If 'search' is given for a table without searchable fields, it returns an HTTP 400 Bad Request status
+            with a JSON body containing 'detail': 'Table has no searchable fields.'
+
+            If the query is refused by admission control, it returns an HTTP 400 Bad Request, 429 Too Many Requests
+            or 503 Service Unavailable status with a JSON body containing the reason in 'detail'.
+
+            If the rows are successfully fetched, it returns an HTTP 200 OK status with a JSON body containing
+            the rows.
+
+            If there is any validation error in the query parameters, it returns an HTTP 400 Bad Request status
+            with a JSON body containing the validation errors.
+        """
+        try:
+            table_metadata = TableMetadata.get_by_id(table_metadata_id=pk)
+        except TableMetadata.DoesNotExist:
+            return Response({'detail': 'Table not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TableDataQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        search = serializer.validated_data.get('search')
+        if search and not get_searchable_field_names(table_metadata.fields):
+            return Response({'detail': 'Table has no searchable fields.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = ', '.join(['id'] + [field['name'] for field in table_metadata.fields])
+        sql = f"SELECT {columns} FROM {table_metadata.table_name}"
+        params = []
+
+        sample = serializer.validated_data.get('sample')
+        seed = serializer.validated_data.get('seed')
+        if sample is not None:
+            sample_method = serializer.validated_data['sample_method'].upper()
+            sql += f" TABLESAMPLE {sample_method} (%s)"
+            params.append(sample)
+            if seed is not None:
+                sql += " REPEATABLE (%s)"
+                params.append(seed)
+
+        if search:
+            document = get_search_document_sql(table_metadata.fields)
+            query = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+            sql += f" WHERE {document} @@ {query} ORDER BY ts_rank({document}, {query}) DESC, id"
+            params += [search, search]
+        elif sample is not None and seed is not None:
+            # A seeded shuffle keeps the order of the sample stable across pages.
+            sql += " ORDER BY md5(%s || id::text)"
+            params.append(str(seed))
+        elif sample is not None:
+            # The sample already bounds the number of rows, so sorting them randomly is cheap.
+            sql += " ORDER BY random()"
+        else:
+            sql += " ORDER BY id"
+
+        sql += " LIMIT %s OFFSET %s"
+        params += [serializer.validated_data['limit'], serializer.validated_data['offset']]
+
+        try:
+            with admit_query(table_metadata.table_name, sql, params):
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = dictfetchall(cursor)
+        except QueryRejected as exc:
+            return Response({'detail': exc.detail}, status=exc.status_code)
+
+        return Response(rows, status=status.HTTP_200_OK)
+
+
+class TableStatsView(APIView):
+    """
+    The TableStatsView is a Django REST Framework view that provides an API endpoint for getting statistics of a table
+    in the database. It inherits from the APIView provided by the Django REST Framework.
+
+    Methods:
+        get: Accepts a GET request with optional 'exact' and 'timeout_ms' query parameters.
+             Returns the estimated row count, on-disk size and per-column null fraction and distinct estimates,
+             read from the planner statistics without scanning the table.
+             If 'exact' is true, it also counts the rows with count(*). The count is not held to the query cost
+             budget, since counting a large table always exceeds it; 'timeout_ms' bounds it instead.
+             If the table does not exist, it returns an HTTP 404 Not Found status.
+             If the statistics are successfully fetched, it returns an HTTP 200 OK status along with them.
+    """
+
+    @swagger_auto_schema(
+        query_serializer=TableStatsQuerySerializer,
+        responses={200: 'Statistics of the table'},
+        operation_description="Endpoint to get row count estimate, size and column statistics of table in DB"
+    )
+    def get(self, request, pk):
+        """
+        Accepts a GET request with optional 'exact' and 'timeout_ms' query parameters.
+        Returns the estimated row count, on-disk size and per-column null fraction and distinct estimates.
+
+        Parameters:
+            request: A Django REST Framework request object.
+            pk: An integer representing the primary key of the table metadata.
+
+        Returns:
+            If the table does not exist, it returns an HTTP 404 Not Found status with a JSON body containing
+            'detail': 'Table not found.'
+
+            If the statistics are successfully fetched, it returns an HTTP 200 OK status with a JSON body containing
+            'estimated_row_count', 'total_size_bytes', 'table_size_bytes' and 'columns'.
+            If 'exact' is true, the body also contains 'exact_row_count'. When the count is refused by admission
+            control or does not finish within 'timeout_ms', 'exact_row_count' is null and
+            'exact_row_count_detail' contains the reason.
+
+            If there is any validation error in the query parameters, it returns an HTTP 400 Bad Request status
+            with a JSON body containing the validation errors.
+        """
+        try:
+            table_metadata = TableMetadata.get_by_id(table_metadata_id=pk)
+        except TableMetadata.DoesNotExist:
+            return Response({'detail': 'Table not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = TableStatsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        stats = get_table_stats(table_metadata.table_name)
+        if stats is None:
+            return Response({'detail': 'Table not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if serializer.validated_data['exact']:
+            sql = f"SELECT count(*) FROM {table_metadata.table_name}"
+            try:
+                with admit_query(
+                    table_metadata.table_name,
+                    sql,
+                    statement_timeout_ms=serializer.validated_data.get('timeout_ms'),
+                    check_budget=False
+                ):
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql)
+                        stats['exact_row_count'] = cursor.fetchone()[0]
+            except QueryRejected as exc:
+                stats['exact_row_count'] = None
+                stats['exact_row_count_detail'] = exc.detail
+
+        return Response(stats, status=status.HTTP_200_OK)
+
+
+class AdmissionMetricsView(APIView):
+    """
+    The AdmissionMetricsView is a Django REST Framework view that exposes the admission control counters.
+    It inherits from the APIView provided by the Django REST Framework.
+
+    Methods:
+        get: Accepts a GET request. Returns the number of admitted, queued and rejected queries, statement
+             timeouts and cost estimate cache hits and misses, summed over all processes sharing the database.
+             Counts of other processes may lag by up to METRICS_FLUSH_INTERVAL seconds.
+    """
+
+    @swagger_auto_schema(
+        operation_description="Endpoint to get admission control metrics"
+    )
+    def get(self, request):
+        return Response(get_metrics(), status=status.HTTP_200_OK)
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamicTables', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'admission_metric',
+            },
+        ),
+    ]
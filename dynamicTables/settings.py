@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,9 +39,15 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'dynamicTables',
-    'drf_yasg',
 ]
 
+# Swagger and ReDoc API docs. drf_yasg is only loaded when docs are served and its schema tooling is only
+# imported on the first docs request. Set DYNAMIC_TABLES_SERVE_DOCS=0 on pods that never serve docs.
+SERVE_API_DOCS = os.environ.get('DYNAMIC_TABLES_SERVE_DOCS', '1') == '1'
+
+if SERVE_API_DOCS:
+    INSTALLED_APPS.append('drf_yasg')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -88,6 +95,12 @@ DATABASES = {
 }
 
 
+# Admission control for reads against dynamic tables. Overrides DEFAULT_ADMISSION_SETTINGS in
+# dynamicTables/app/admission.py, e.g. {'MAX_QUERY_COST': 500_000}. Costs are PostgreSQL planner cost units.
+
+DYNAMIC_TABLES_ADMISSION = {}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,17 @@
+import pytest
+from django.db import connection
+
+from dynamicTables.app.utils import get_search_index_name
+
+
+@pytest.fixture
+def search_indexdef():
+    def get_search_indexdef(table_name):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+                [table_name, get_search_index_name(table_name)]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    return get_search_indexdef
@@ -0,0 +1,31 @@
+import pytest
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK
+from rest_framework.test import APIClient
+
+from dynamicTables.app.admission import record_metric, reset_admission_state
+from dynamicTables.app.models import AdmissionMetric
+
+
+class TestAdmissionMetricsView:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('admission_metrics')
+        reset_admission_state()
+
+    @pytest.mark.django_db
+    def test_get_admission_metrics_sums_all_processes(self):
+        AdmissionMetric.increment({'admitted_light': 3, 'queued': 1})
+        record_metric('admitted_light')
+        record_metric('admitted_heavy', 2)
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == {'admitted_light': 4, 'admitted_heavy': 2, 'queued': 1}
+
+    @pytest.mark.django_db
+    def test_get_admission_metrics_flushes_buffer_once(self):
+        record_metric('admitted_light')
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        assert response.json() == {'admitted_light': 1}
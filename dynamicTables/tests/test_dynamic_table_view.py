@@ -39,3 +39,46 @@ class TestDynamicTableView:
         }
         response = self.client.post(self.url, data, format='json')
         assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_create_table_with_searchable_field(self, search_indexdef):
+        data = {
+            'table_name': 'test_table',
+            'fields': [{'name': 'field1', 'type': 'string', 'searchable': True}, {'name': 'field2', 'type': 'number'}]
+        }
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code == HTTP_201_CREATED
+        indexdef = search_indexdef('test_table')
+        assert 'USING gin' in indexdef
+        assert "to_tsvector('simple'::regconfig, (COALESCE(field1, ''::character varying))::text)" in indexdef
+
+    @pytest.mark.django_db
+    def test_create_table_failed_with_searchable_non_string_field(self):
+        data = {
+            'table_name': 'test_table',
+            'fields': [{'name': 'field1', 'type': 'boolean', 'searchable': True}]
+        }
+        response = self.client.post(self.url, data, format='json')
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_create_table_without_searchable_field_has_no_search_index(self, search_indexdef):
+        data = {
+            'table_name': 'test_table',
+            'fields': [{'name': 'field1', 'type': 'string'}]
+        }
+        self.client.post(self.url, data, format='json')
+        assert search_indexdef('test_table') is None
+
+    @pytest.mark.django_db
+    def test_create_tables_with_long_names_sharing_a_prefix(self, search_indexdef):
+        table_names = ['t' * 59 + '_a', 't' * 59 + '_b']
+        for table_name in table_names:
+            data = {
+                'table_name': table_name,
+                'fields': [{'name': 'field1', 'type': 'string', 'searchable': True}]
+            }
+            response = self.client.post(self.url, data, format='json')
+            assert response.status_code == HTTP_201_CREATED
+        for table_name in table_names:
+            assert 'USING gin' in search_indexdef(table_name)
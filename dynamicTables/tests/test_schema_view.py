@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK
+from rest_framework.test import APIClient
+
+from dynamicTables.app.models import TableMetadata
+from dynamicTables.app.schema_generator import clear_schema_tables
+
+
+class TestSchemaView:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = reverse('schema-json', kwargs={'format': '.json'})
+        clear_schema_tables()
+
+    @pytest.mark.django_db
+    def test_get_schema_with_table_definitions(self):
+        TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}, {'name': 'field2', 'type': 'boolean'}]
+        )
+        response = self.client.get(self.url)
+        assert response.status_code == HTTP_200_OK
+        definition = response.json()['definitions']['test_table_row']
+        assert definition['properties']['id']['type'] == 'integer'
+        assert definition['properties']['field1'] == {'type': 'string', 'maxLength': 255}
+        assert definition['properties']['field2'] == {'type': 'boolean'}
+        operation = response.json()['paths']['/table/{id}/data']['get']
+        assert operation['description'] == 'Endpoint to read a page of rows from table in DB'
+
+    @pytest.mark.django_db
+    def test_get_schema_table_path_refers_to_table_definition(self):
+        table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}]
+        )
+        schema = self.client.get(self.url).json()
+        operation = schema['paths'][f'/table/{table_metadata.id}/data']['get']
+        rows_schema = operation['responses']['200']['schema']
+        assert rows_schema['type'] == 'array'
+        ref = rows_schema['items']['$ref']
+        assert ref.startswith('#/definitions/')
+        definition = schema['definitions'][ref[len('#/definitions/'):]]
+        assert definition['title'] == 'test_table'
+        assert set(definition['properties']) == {'id', 'field1'}
+        assert 'limit' in [parameter['name'] for parameter in operation['parameters']]
+
+    @pytest.mark.django_db
+    def test_get_schema_served_from_cache(self, django_assert_num_queries):
+        TableMetadata.objects.create(table_name='test_table', fields=[{'name': 'field1', 'type': 'string'}])
+        self.client.get(self.url)
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url)
+        assert 'test_table_row' in response.json()['definitions']
+
+    @pytest.mark.django_db
+    def test_get_schema_regenerated_after_table_change(self):
+        table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}]
+        )
+        self.client.get(self.url)
+        table_metadata.fields = table_metadata.fields + [{'name': 'field2', 'type': 'boolean'}]
+        table_metadata.save()
+        response = self.client.get(self.url)
+        assert 'field2' in response.json()['definitions']['test_table_row']['properties']
+
+    @pytest.mark.django_db
+    def test_get_swagger_ui(self):
+        response = self.client.get(reverse('schema-swagger-ui'))
+        assert response.status_code == HTTP_200_OK
+
+    def test_drf_yasg_not_loaded_when_docs_disabled(self):
+        code = (
+            "import sys, django; django.setup(); import dynamicTables.urls; "
+            "print(any(name.startswith('drf_yasg') for name in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='dynamicTables.settings', DYNAMIC_TABLES_SERVE_DOCS='0')
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == 'False'
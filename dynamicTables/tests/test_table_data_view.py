@@ -0,0 +1,227 @@
+import pytest
+from django.db import connection, connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_429_TOO_MANY_REQUESTS,
+    HTTP_503_SERVICE_UNAVAILABLE
+)
+from rest_framework.test import APIClient
+
+from dynamicTables.app.admission import estimate_query_cost, get_metrics, reset_admission_state
+from dynamicTables.app.models import TableMetadata
+from dynamicTables.app.utils import get_search_document_sql
+
+
+class TestTableDataView:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, db):
+        self.client = APIClient()
+        self.url = lambda pk: reverse('get_table_data', kwargs={'pk': pk})
+        reset_admission_state()
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE test_table (
+                    id serial PRIMARY KEY,
+                    field1 varchar(100),
+                    field2 integer
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO test_table (field1, field2)
+                VALUES ('test_string', 1), ('other_string', 2)
+            """)
+        self.table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}, {'name': 'field2', 'type': 'number'}]
+        )
+
+    def insert_rows(self, count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO test_table (field1, field2) SELECT 'row_' || g, g FROM generate_series(1, %s) g",
+                [count]
+            )
+
+    @pytest.mark.django_db
+    def test_get_table_data_success(self):
+        response = self.client.get(self.url(self.table_metadata.id))
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == [
+            {'id': 1, 'field1': 'test_string', 'field2': 1},
+            {'id': 2, 'field1': 'other_string', 'field2': 2},
+        ]
+        assert get_metrics()['admitted_light'] == 1
+
+    @pytest.mark.django_db
+    def test_get_table_data_paginated(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'limit': 1, 'offset': 1})
+        assert response.status_code == HTTP_200_OK
+        assert response.json() == [{'id': 2, 'field1': 'other_string', 'field2': 2}]
+
+    @pytest.mark.django_db
+    def test_get_table_data_sampled(self):
+        response = self.client.get(
+            self.url(self.table_metadata.id), {'sample': 100, 'sample_method': 'bernoulli'}
+        )
+        assert response.status_code == HTTP_200_OK
+        assert len(response.json()) == 2
+
+    @pytest.mark.django_db
+    def test_get_table_data_sampled_rows_are_not_lowest_ids(self):
+        self.insert_rows(10_000)
+        response = self.client.get(
+            self.url(self.table_metadata.id), {'sample': 100, 'sample_method': 'bernoulli'}
+        )
+        assert response.status_code == HTTP_200_OK
+        ids = [row['id'] for row in response.json()]
+        assert len(ids) == 100
+        assert ids != list(range(1, 101))
+        assert max(ids) > 100
+
+    @pytest.mark.django_db
+    def test_get_table_data_seeded_sample_pages_are_stable(self):
+        self.insert_rows(10_000)
+        params = {'sample': 50, 'sample_method': 'system', 'seed': 42}
+        first_page = self.client.get(self.url(self.table_metadata.id), params).json()
+        assert self.client.get(self.url(self.table_metadata.id), params).json() == first_page
+        second_page = self.client.get(self.url(self.table_metadata.id), {**params, 'offset': 100}).json()
+        assert not {row['id'] for row in first_page} & {row['id'] for row in second_page}
+
+    @pytest.mark.django_db
+    def test_get_table_data_seed_without_sample(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'seed': 42})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_get_table_data_invalid_sample(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'sample': 0})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_get_table_data_search(self):
+        self.client.post(reverse('add_table'), {
+            'table_name': 'search_table',
+            'fields': [{'name': 'title', 'type': 'string', 'searchable': True}, {'name': 'body', 'type': 'string'}]
+        }, format='json')
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO search_table (title, body)
+                VALUES ('quick brown fox', 'fox'), ('lazy dog', 'fox'), ('fox and another fox', 'dog')
+            """)
+        table_metadata = TableMetadata.objects.get(table_name='search_table')
+        response = self.client.get(self.url(table_metadata.id), {'search': 'fox'})
+        assert response.status_code == HTTP_200_OK
+        assert [row['title'] for row in response.json()] == ['fox and another fox', 'quick brown fox']
+
+    @pytest.mark.django_db
+    def test_get_table_data_search_uses_search_index(self):
+        self.client.post(reverse('add_table'), {
+            'table_name': 'search_table',
+            'fields': [{'name': 'title', 'type': 'string', 'searchable': True}, {'name': 'body', 'type': 'string'}]
+        }, format='json')
+        document = get_search_document_sql(TableMetadata.objects.get(table_name='search_table').fields)
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(
+                f"EXPLAIN SELECT id FROM search_table WHERE {document} @@ websearch_to_tsquery('simple', 'fox')"
+            )
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        assert 'search_table_search_idx' in plan
+
+    @pytest.mark.django_db
+    def test_get_table_data_search_without_searchable_fields(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'search': 'test'})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'Table has no searchable fields.'
+
+    @pytest.mark.django_db
+    def test_get_table_data_cost_estimate_cached(self):
+        self.client.get(self.url(self.table_metadata.id), {'offset': 1})
+        self.client.get(self.url(self.table_metadata.id), {'offset': 5})
+        metrics = get_metrics()
+        assert metrics['cost_cache_misses'] == 1
+        assert metrics['cost_cache_hits'] == 1
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={'MAX_QUERY_COST': 0})
+    def test_get_table_data_rejected_over_budget(self):
+        response = self.client.get(self.url(self.table_metadata.id))
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'Query cost exceeds budget.'
+        assert get_metrics()['rejected_over_budget'] == 1
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={'MAX_QUERY_COST': 1000})
+    def test_get_table_data_cached_cheap_estimate_does_not_admit_deep_offset(self):
+        self.insert_rows(300_000)
+        response = self.client.get(self.url(self.table_metadata.id), {'offset': 0})
+        assert response.status_code == HTTP_200_OK
+        response = self.client.get(self.url(self.table_metadata.id), {'offset': 299_000})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'Query cost exceeds budget.'
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={'MAX_QUERY_COST': 1000, 'COST_CACHE_SIZE_CHECK_INTERVAL': 0})
+    def test_get_table_data_cached_estimate_discarded_after_table_growth(self):
+        params = {'sample': 100, 'sample_method': 'bernoulli'}
+        response = self.client.get(self.url(self.table_metadata.id), params)
+        assert response.status_code == HTTP_200_OK
+        self.insert_rows(300_000)
+        response = self.client.get(self.url(self.table_metadata.id), params)
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'Query cost exceeds budget.'
+
+    @pytest.mark.django_db
+    def test_cost_estimate_cache_hit_runs_no_query(self, django_assert_num_queries):
+        sql = "SELECT id, field1, field2 FROM test_table ORDER BY id LIMIT %s OFFSET %s"
+        cost = estimate_query_cost('test_table', sql, [100, 0])
+        with django_assert_num_queries(0):
+            assert estimate_query_cost('test_table', sql, [100, 0]) == cost
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={
+        'HEAVY_QUERY_COST': 0, 'MAX_HEAVY_QUERIES_PER_TABLE': 1, 'QUEUE_TIMEOUT': 0.1
+    })
+    def test_get_table_data_rejected_when_heavy_slots_taken(self):
+        other_connection = connections.create_connection('default')
+        try:
+            with other_connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(hashtext('test_table'), 0)")
+            response = self.client.get(self.url(self.table_metadata.id))
+            assert response.status_code == HTTP_429_TOO_MANY_REQUESTS
+            metrics = get_metrics()
+            assert metrics['queued'] == 1
+            assert metrics['rejected_queue_timeout'] == 1
+
+            with other_connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext('test_table'), 0)")
+            response = self.client.get(self.url(self.table_metadata.id))
+            assert response.status_code == HTTP_200_OK
+            assert get_metrics()['admitted_heavy'] == 1
+        finally:
+            other_connection.close()
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={'STATEMENT_TIMEOUT_MS': 1})
+    def test_get_table_data_statement_timeout(self):
+        self.insert_rows(300_000)
+        response = self.client.get(self.url(self.table_metadata.id), {'offset': 299_000})
+        assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()['detail'] == 'Query timed out.'
+        assert get_metrics()['statement_timeouts'] == 1
+
+    @pytest.mark.django_db
+    def test_get_table_data_invalid_limit(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'limit': 0})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_get_table_data_not_found(self):
+        response = self.client.get(self.url(1000))
+        assert response.status_code == HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Table not found.'
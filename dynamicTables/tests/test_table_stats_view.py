@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+from rest_framework.test import APIClient
+
+from dynamicTables.app.admission import reset_admission_state
+from dynamicTables.app.models import TableMetadata
+
+
+class TestTableStatsView:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, db):
+        self.client = APIClient()
+        self.url = lambda pk: reverse('get_table_stats', kwargs={'pk': pk})
+        reset_admission_state()
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE test_table (
+                    id serial PRIMARY KEY,
+                    field1 varchar(100),
+                    field2 integer
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO test_table (field1, field2)
+                VALUES ('test_string', 1), (NULL, 2)
+            """)
+            cursor.execute("ANALYZE test_table")
+        self.table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}, {'name': 'field2', 'type': 'number'}]
+        )
+
+    @pytest.mark.django_db
+    def test_get_table_stats_success(self):
+        response = self.client.get(self.url(self.table_metadata.id))
+        assert response.status_code == HTTP_200_OK
+        data = response.json()
+        assert data['estimated_row_count'] == 2
+        assert data['total_size_bytes'] > 0
+        assert 'exact_row_count' not in data
+        columns = {column['name']: column for column in data['columns']}
+        assert columns['field1']['null_fraction'] == 0.5
+
+    @pytest.mark.django_db
+    def test_get_table_stats_exact_count(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'exact': 'true', 'timeout_ms': 1000})
+        assert response.status_code == HTTP_200_OK
+        assert response.json()['exact_row_count'] == 2
+
+    @pytest.mark.django_db
+    @override_settings(DYNAMIC_TABLES_ADMISSION={'MAX_QUERY_COST': 0})
+    def test_get_table_stats_exact_count_ignores_cost_budget(self):
+        response = self.client.get(self.url(self.table_metadata.id), {'exact': 'true'})
+        assert response.status_code == HTTP_200_OK
+        assert response.json()['exact_row_count'] == 2
+
+    @pytest.mark.django_db
+    def test_get_table_stats_exact_count_timeout(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO test_table (field1, field2) SELECT 'row_' || g, g FROM generate_series(1, 300000) g"
+            )
+        response = self.client.get(self.url(self.table_metadata.id), {'exact': 'true', 'timeout_ms': 1})
+        assert response.status_code == HTTP_200_OK
+        data = response.json()
+        assert data['estimated_row_count'] == 2
+        assert data['exact_row_count'] is None
+        assert data['exact_row_count_detail'] == 'Query timed out.'
+
+    @pytest.mark.django_db
+    def test_get_table_stats_not_found(self):
+        response = self.client.get(self.url(1000))
+        assert response.status_code == HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Table not found.'
@@ -5,6 +5,7 @@ from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_200_OK, HTTP_404_NO
 from rest_framework.test import APIClient
 
 from dynamicTables.app.models import TableMetadata
+from dynamicTables.app.utils import get_search_index_name
 
 
 class TestUpdateTableRowView:
@@ -56,3 +57,95 @@ class TestUpdateTableRowView:
         }
         response = self.client.post(self.url(table_metadata.id), data, format='json')
         assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_update_table_row_with_searchable_field(self, search_indexdef):
+        table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'},
+                    {'name': 'field2', 'type': 'number'}]
+        )
+        data = {
+            'fields': [{'name': 'title', 'type': 'string', 'searchable': True}]
+        }
+        response = self.client.post(self.url(table_metadata.id), data, format='json')
+        assert response.status_code == HTTP_200_OK
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = 'test_table' AND column_name = 'title'
+            """)
+            assert cursor.fetchone() is not None
+        assert 'title' in search_indexdef('test_table')
+
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO test_table (title) VALUES ('quick brown fox'), ('lazy dog')")
+        response = self.client.get(reverse('get_table_data', kwargs={'pk': table_metadata.id}), {'search': 'fox'})
+        assert response.status_code == HTTP_200_OK
+        assert [row['title'] for row in response.json()] == ['quick brown fox']
+
+    @pytest.mark.django_db
+    def test_update_table_row_rebuilds_search_index_over_all_searchable_fields(self, search_indexdef):
+        table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'},
+                    {'name': 'field2', 'type': 'number'}]
+        )
+        for name in ['title', 'body']:
+            data = {'fields': [{'name': name, 'type': 'string', 'searchable': True}]}
+            self.client.post(self.url(table_metadata.id), data, format='json')
+
+        indexdef = search_indexdef('test_table')
+        assert 'title' in indexdef and 'body' in indexdef
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'test_table'")
+            assert sorted(row[0] for row in cursor.fetchall()) == ['test_table_pkey', 'test_table_search_idx']
+
+    @pytest.mark.django_db
+    def test_update_table_row_with_searchable_field_and_long_table_name(self, search_indexdef):
+        table_name = 'a' * 60
+        self.client.post(reverse('add_table'), {
+            'table_name': table_name,
+            'fields': [{'name': 'title', 'type': 'string', 'searchable': True}]
+        }, format='json')
+        table_metadata = TableMetadata.objects.get(table_name=table_name)
+
+        data = {'fields': [{'name': 'body', 'type': 'string', 'searchable': True}]}
+        response = self.client.post(self.url(table_metadata.id), data, format='json')
+        assert response.status_code == HTTP_200_OK
+        assert 'warning' not in response.json()
+
+        indexdef = search_indexdef(table_name)
+        assert 'title' in indexdef and 'body' in indexdef
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table_name])
+            index_names = [row[0] for row in cursor.fetchall()]
+        assert len(index_names) == 2
+        assert all(len(index_name) <= 63 for index_name in index_names)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {table_name} (title, body) VALUES ('lazy dog', 'quick brown fox')")
+        response = self.client.get(reverse('get_table_data', kwargs={'pk': table_metadata.id}), {'search': 'fox'})
+        assert [row['body'] for row in response.json()] == ['quick brown fox']
+
+    @pytest.mark.django_db
+    def test_update_table_row_keeps_search_index_when_rebuild_fails(self, search_indexdef):
+        self.client.post(reverse('add_table'), {
+            'table_name': 'search_table',
+            'fields': [{'name': 'title', 'type': 'string', 'searchable': True}]
+        }, format='json')
+        table_metadata = TableMetadata.objects.get(table_name='search_table')
+        with connection.cursor() as cursor:
+            # Occupies the name of the new index, so building it fails.
+            cursor.execute(f"CREATE TABLE {get_search_index_name('search_table', 'search_new')} (id integer)")
+
+        data = {'fields': [{'name': 'body', 'type': 'string', 'searchable': True}]}
+        response = self.client.post(self.url(table_metadata.id), data, format='json')
+        assert response.status_code == HTTP_200_OK
+        assert 'warning' in response.json()
+
+        indexdef = search_indexdef('search_table')
+        assert 'title' in indexdef and 'body' not in indexdef
+        response = self.client.get(reverse('get_table_data', kwargs={'pk': table_metadata.id}), {'search': 'fox'})
+        assert response.status_code == HTTP_200_OK
@@ -48,3 +48,18 @@ class TestUpdateTableView:
         }
         response = self.client.put(self.url(table_metadata.id), data, format='json')
         assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_update_table_with_searchable_field(self, search_indexdef):
+        table_metadata = TableMetadata.objects.create(
+            table_name='test_table',
+            fields=[{'name': 'field1', 'type': 'string'}]
+        )
+        data = {
+            'fields': [{'name': 'new_field1', 'type': 'string', 'searchable': True}]
+        }
+        response = self.client.put(self.url(table_metadata.id), data, format='json')
+        assert response.status_code == HTTP_200_OK
+        assert 'new_field1' in search_indexdef('test_table')
+        table_metadata.refresh_from_db()
+        assert table_metadata.fields == [{'name': 'new_field1', 'type': 'string', 'searchable': True}]
@@ -14,30 +14,20 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 
 from dynamicTables.app.views import (
     DynamicTableView,
     UpdateTableView,
     UpdateTableRowView,
-    TableRowsView
-)
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Dynamic tables",
-        default_version='v1',
-        description="Dynamic table API generator",
-        contact=openapi.Contact(email="temirlan1990@gmail.com"),
-        license=openapi.License(name="No any license"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
+    TableRowsView,
+    TableDataView,
+    TableStatsView,
+    AdmissionMetricsView
 )
+from dynamicTables.app.schema import lazy_schema_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -45,7 +35,14 @@ urlpatterns = [
     path('api/table/<int:pk>', UpdateTableView.as_view(), name='update_table'),
     path('api/table/<int:pk>/row', UpdateTableRowView.as_view(), name='update_table_row'),
     path('api/table/<int:pk>/rows', TableRowsView.as_view(), name='get_table_rows'),
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('api/table/<int:pk>/data', TableDataView.as_view(), name='get_table_data'),
+    path('api/table/<int:pk>/stats', TableStatsView.as_view(), name='get_table_stats'),
+    path('api/metrics/admission', AdmissionMetricsView.as_view(), name='admission_metrics'),
 ]
+
+if settings.SERVE_API_DOCS:
+    urlpatterns += [
+        path('swagger<format>/', lazy_schema_view(), name='schema-json'),
+        path('swagger/', lazy_schema_view('swagger'), name='schema-swagger-ui'),
+        path('redoc/', lazy_schema_view('redoc'), name='schema-redoc'),
+    ]